@@ -9,8 +9,83 @@ st.set_page_config(page_title="FTC DECODE Strategy Simulator", layout="wide")
 
 st.title("🤖 FTC DECODE — Strategy Simulator")
 
+# ---- cached helpers: inputs are passed as tuples so they hash cheaply ----
+@st.cache_data(show_spinner=False)
+def _cached_compute(start, artifacts_tuple, params_tuple):
+    return compute_strategy(start, list(artifacts_tuple), dict(params_tuple))
+
+@st.cache_data(show_spinner=False)
+def _cached_layout():
+    return default_field_layout()
+
+@st.cache_data(show_spinner=False)
+def coach_tips(remaining, auton_multiplier, auton_time, decode_bonus):
+    tips = []
+    if remaining > 0:
+        tips.append("- Consider increasing robot speed, or prioritizing artifacts inside the decode zone during auton.")
+    if auton_multiplier > 1.2 and auton_time > 10:
+        tips.append("- Focus on quick pickups during autonomous to exploit the multiplier.")
+    if decode_bonus > 0:
+        tips.append("- Decode zone grants bonus: plan path to include those artifacts early if close.")
+    if not tips:
+        tips.append("- Strategy looks balanced for current parameters.")
+    return tips
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_field_figure(start, artifacts_t, path_t, dz):
+    """
+    Field map with artifacts, start, decode zone and the planned path (path_t = (xs, ys)).
+    Kept as a go.Figure: st.plotly_chart passes a Figure through, but rebuilds and
+    re-validates a dict on every call.
+    """
+    fig = go.Figure()
+    # field bounds
+    WIDTH, HEIGHT = 600, 400
+
+    # artifacts
+    xs = [p[0] for p in artifacts_t]
+    ys = [p[1] for p in artifacts_t]
+    fig.add_trace(go.Scattergl(x=xs, y=ys, mode="markers+text",
+                               marker=dict(size=12), text=[f"A{i+1}" for i in range(len(artifacts_t))],
+                               textposition="top center", name="Artifacts"))
+
+    # start point
+    fig.add_trace(go.Scattergl(x=[start[0]], y=[start[1]], mode="markers+text",
+                               marker=dict(size=14, color="green"), text=["Start"],
+                               textposition="bottom center", name="Start"))
+
+    # decode zone circle as a native layout shape; an empty trace gives it a legend entry
+    (cx, cy), r = dz
+    zone_color = "#00cc96"
+    fig.add_shape(type="circle", xref="x", yref="y",
+                  x0=cx - r, y0=cy - r, x1=cx + r, y1=cy + r,
+                  fillcolor=zone_color, opacity=0.15, line=dict(width=0), layer="below")
+    fig.add_trace(go.Scatter(x=[None], y=[None], mode="markers",
+                             marker=dict(size=14, color=zone_color, opacity=0.3),
+                             name="Decode zone"))
+
+    # path line
+    path_x, path_y = path_t
+    if path_x:
+        fig.add_trace(go.Scattergl(x=path_x, y=path_y, mode="lines+markers",
+                                   line=dict(width=3), name="Planned path"))
+
+    fig.update_layout(
+        width=900, height=600,
+        xaxis=dict(range=[0, WIDTH], title="Field X"),
+        yaxis=dict(range=[0, HEIGHT], title="Field Y", autorange="reversed"),
+        showlegend=True, title="Field map (units arbitrary)"
+    )
+    return fig
+
 # ---- left: parameters ----
-with st.sidebar:
+@st.fragment
+def render_sidebar():
+    """
+    Sidebar inputs. Runs as a fragment so editing a widget only reruns the sidebar;
+    the run button records a run request in session state and triggers a full rerun.
+    Returns (start, artifacts, params) for the main panel.
+    """
     st.header("Match & Robot Parameters")
     match_time = st.number_input("Match time (s)", min_value=30, max_value=300, value=150, step=10)
     auton_time = st.number_input("Autonomous time (s)", min_value=5, max_value=60, value=30, step=5)
@@ -19,10 +94,11 @@ with st.sidebar:
     points_per_artifact = st.number_input("Base points per artifact", min_value=1, max_value=50, value=5, step=1)
     decode_bonus = st.number_input("Decode zone bonus (points)", min_value=0, max_value=50, value=3, step=1)
     auton_multiplier = st.number_input("Autonomous points multiplier", min_value=1.0, max_value=3.0, value=1.5, step=0.1)
+    use_2opt = st.checkbox("Refine path with 2-opt", value=False)
 
     st.markdown("---")
     st.header("Field / Artifacts")
-    preset = default_field_layout()
+    preset = _cached_layout()
     use_preset = st.checkbox("Use default field layout (recommended)", value=True)
     if use_preset:
         start = preset["start"]
@@ -49,14 +125,6 @@ with st.sidebar:
         dz_radius = st.number_input("Decode radius", value=70)
         decode_zone = ((dz_center_x, dz_center_y), dz_radius)
 
-    st.markdown("---")
-    if st.button("Run strategy simulation"):
-        run_sim = True
-    else:
-        run_sim = False
-
-# ---- main area: run & visualize ----
-if run_sim:
     params = {
         "robot_speed": robot_speed,
         "pickup_time": pickup_time,
@@ -65,10 +133,24 @@ if run_sim:
         "points_per_artifact": points_per_artifact,
         "decode_zone": decode_zone,
         "decode_bonus": decode_bonus,
-        "auton_multiplier": auton_multiplier
+        "auton_multiplier": auton_multiplier,
+        "use_2opt": use_2opt
     }
 
-    result = compute_strategy(start, artifacts, params)
+    st.markdown("---")
+    if st.button("Run strategy simulation"):
+        st.session_state["run_sim"] = True
+        st.rerun()
+
+    return start, artifacts, params
+
+# ---- main area: run & visualize ----
+@st.fragment
+def render_results(start, artifacts, params, result):
+    match_time = params["match_time"]
+    auton_time = params["auton_time"]
+    decode_bonus = params["decode_bonus"]
+    decode_zone = params["decode_zone"]
 
     st.subheader("🔎 Strategy summary")
     st.metric("Expected score", f"{result['expected_score']:.1f} pts")
@@ -77,85 +159,61 @@ if run_sim:
 
     # visited table
     visited = result["visited"]
-    if visited:
-        tbl = []
-        for i, v in enumerate(visited, 1):
-            tbl.append({
-                "Order": i,
-                "X": v["pos"][0],
-                "Y": v["pos"][1],
-                "Travel time (s)": round(v["travel_time"], 2),
-                "Pickup time (s)": v["pickup_time"],
-                "Time at pickup (s)": round(v["time_at_pickup"], 2),
-                "In auton": v["in_auton"],
-                "Points gained": round(v["gained"], 2)
-            })
-        df = pd.DataFrame(tbl)
-        st.table(df)
+    n_visited = len(visited["pos_x"])
+    if n_visited:
+        df = pd.DataFrame({
+            "Order": np.arange(1, n_visited + 1),
+            "X": visited["pos_x"],
+            "Y": visited["pos_y"],
+            "Travel time (s)": visited["travel_time"].round(2),
+            "Pickup time (s)": visited["pickup_time"],
+            "Time at pickup (s)": visited["time_at_pickup"].round(2),
+            "In auton": visited["in_auton"],
+            "Points gained": visited["gained"].round(2)
+        })
+        st.dataframe(df, hide_index=True)
 
     # ---- Visualization: plot field, artifacts, path ----
     st.subheader("🗺 Field visualization")
-    fig = go.Figure()
-    # field bounds
-    WIDTH, HEIGHT = 600, 400
-
-    # artifacts
-    xs = [p[0] for p in artifacts]
-    ys = [p[1] for p in artifacts]
-    fig.add_trace(go.Scatter(x=xs, y=ys, mode="markers+text",
-                             marker=dict(size=12), text=[f"A{i+1}" for i in range(len(artifacts))],
-                             textposition="top center", name="Artifacts"))
-
-    # start point
-    fig.add_trace(go.Scatter(x=[start[0]], y=[start[1]], mode="markers+text",
-                             marker=dict(size=14, color="green"), text=["Start"],
-                             textposition="bottom center", name="Start"))
-
-    # decode zone circle
-    dz_center, dz_radius = decode_zone
-    theta = np.linspace(0, 2*np.pi, 80)
-    circ_x = dz_center[0] + dz_radius * np.cos(theta)
-    circ_y = dz_center[1] + dz_radius * np.sin(theta)
-    fig.add_trace(go.Scatter(x=circ_x, y=circ_y, mode="lines", fill="toself",
-                             opacity=0.15, name="Decode zone"))
-
-    # path line
-    path_x = []
-    path_y = []
-    cur = start
-    for v in visited:
-        path_x.append(cur[0]); path_y.append(cur[1])
-        path_x.append(v["pos"][0]); path_y.append(v["pos"][1])
-        cur = v["pos"]
-
-    if path_x:
-        fig.add_trace(go.Scatter(x=path_x, y=path_y, mode="lines+markers",
-                                 line=dict(width=3), name="Planned path"))
-
-    fig.update_layout(
-        width=900, height=600,
-        xaxis=dict(range=[0, WIDTH], title="Field X"),
-        yaxis=dict(range=[0, HEIGHT], title="Field Y", autorange="reversed"),
-        showlegend=True, title="Field map (units arbitrary)"
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    # path line: each leg is (previous stop -> pickup), interleaved into one trace
+    pos_x, pos_y = visited["pos_x"], visited["pos_y"]
+    path_x = np.empty(2 * n_visited)
+    path_y = np.empty(2 * n_visited)
+    path_x[0::2] = np.concatenate([[start[0]], pos_x[:-1]])
+    path_x[1::2] = pos_x
+    path_y[0::2] = np.concatenate([[start[1]], pos_y[:-1]])
+    path_y[1::2] = pos_y
+
+    fig = build_field_figure(tuple(start), tuple(map(tuple, artifacts)),
+                             (tuple(path_x.tolist()), tuple(path_y.tolist())), decode_zone)
+    st.plotly_chart(fig, use_container_width=True,
+                    config={"staticPlot": False, "displayModeBar": False})
 
     # Notes and suggestions
     st.markdown("---")
     st.subheader("Coach tips (automatically generated)")
-    tips = []
-    if result["remaining_artifacts"] > 0:
-        tips.append("- Consider increasing robot speed, or prioritizing artifacts inside the decode zone during auton.")
-    if autonom_multiplier > 1.2 and auton_time > 10:
-        tips.append("- Focus on quick pickups during autonomous to exploit the multiplier.")
-    if decode_bonus > 0:
-        tips.append("- Decode zone grants bonus: plan path to include those artifacts early if close.")
-    if not tips:
-        tips.append("- Strategy looks balanced for current parameters.")
-
+    tips = coach_tips(result["remaining_artifacts"], params["auton_multiplier"], auton_time, decode_bonus)
     for t in tips:
         st.write(t)
 
+with st.sidebar:
+    start, artifacts, params = render_sidebar()
+
+# a run request computes (or reuses) the result for the current inputs; the last
+# result is kept in session state so it survives later reruns without recomputing
+if st.session_state.pop("run_sim", False):
+    inputs = (tuple(start), tuple(map(tuple, artifacts)), tuple(sorted(params.items())))
+    # keyed on the inputs themselves, not hash(inputs): hash(-1) == hash(-2)
+    if st.session_state.get("last_result_key") != inputs:
+        st.session_state["last_result"] = {
+            "start": start,
+            "artifacts": artifacts,
+            "params": params,
+            "result": _cached_compute(*inputs)
+        }
+        st.session_state["last_result_key"] = inputs
+
+if "last_result" in st.session_state:
+    render_results(**st.session_state["last_result"])
 else:
     st.info("Configure parameters in the sidebar and press **Run strategy simulation**.")
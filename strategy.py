@@ -3,11 +3,124 @@ import math
 from typing import List, Tuple, Dict
 import numpy as np
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; _greedy_nn_py is used instead
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
 Point = Tuple[float, float]
 
 def euclid(a: Point, b: Point) -> float:
     return math.hypot(a[0]-b[0], a[1]-b[1])
 
+def _d2(a: Point, b: Point) -> float:
+    # squared distance: enough to rank candidates, no sqrt or hypot scaling
+    dx = a[0]-b[0]
+    dy = a[1]-b[1]
+    return dx*dx + dy*dy
+
+@njit(cache=True)
+def _greedy_nn(D, speed, pickup_time, total_time, cur, t, alive):
+    """
+    Nearest-neighbor kernel over the all-pairs distance matrix D, where row 0 is
+    the start and row k + 1 is artifact k. Picks from the artifacts still set in
+    `alive`, leaving row `cur` at clock time `t`.
+    Returns (order, legs, count): the first `count` entries of `order` are the
+    picked artifact indices and `legs` the travel distance to each of them.
+    """
+    n = D.shape[0] - 1
+    order = np.empty(n, np.int32)
+    legs = np.empty(n)
+    # picked artifacts are masked out in O(1); no list removal or equality scans
+    alive = alive.copy()
+    remaining = np.count_nonzero(alive)
+    count = 0
+    while remaining > 0:
+        best = -1
+        d = np.inf
+        for j in range(n):
+            if alive[j] and D[cur, j + 1] < d:
+                d = D[cur, j + 1]
+                best = j
+        travel_time = d / speed
+        if t + (travel_time + pickup_time) > total_time:
+            break  # no time to go and pick next artifact
+        t += travel_time
+        t += pickup_time
+        order[count] = best
+        legs[count] = d
+        count += 1
+        alive[best] = False
+        remaining -= 1
+        cur = best + 1
+    return order, legs, count
+
+def _greedy_nn_py(
+    pts: List[Point],
+    speed: float,
+    pickup_time: float,
+    total_time: float,
+    cur: int,
+    t: float,
+    alive: List[bool]
+) -> Tuple[List[int], List[float]]:
+    """
+    Plain-Python nearest-neighbor used when numba is not installed; same result as
+    _greedy_nn. pts[0] is the start and pts[k + 1] is artifact k.
+    Returns (order, legs) for the picked artifacts.
+    """
+    arts = pts[1:]
+    n = len(arts)
+    # picked artifacts are masked out in O(1), as in the compiled kernel
+    alive = list(alive)
+    remaining = sum(alive)
+    pos = pts[cur]
+    order = []
+    legs = []
+    while remaining > 0:
+        # single O(n) pass on squared distance; only the winner needs the sqrt
+        k = min((j for j in range(n) if alive[j]), key=lambda j: _d2(pos, arts[j]))
+        d = math.sqrt(_d2(pos, arts[k]))
+        travel_time = d / speed
+        if t + (travel_time + pickup_time) > total_time:
+            break  # no time to go and pick next artifact
+        t += travel_time
+        t += pickup_time
+        order.append(k)
+        legs.append(d)
+        alive[k] = False
+        remaining -= 1
+        pos = arts[k]
+    return order, legs
+
+def _two_opt(D: np.ndarray, route: List[int]) -> List[int]:
+    """
+    2-opt refinement of an open route given as indices into the distance matrix D.
+    route[0] (the start) stays fixed and the end of the route is free.
+    Returns the improved route.
+    """
+    n = len(route)
+    r = list(route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                # reversing r[i:j+1] swaps edges (i-1, i) and (j, j+1)
+                delta = D[r[i-1], r[j]] - D[r[i-1], r[i]]
+                if j + 1 < n:
+                    delta += D[r[i], r[j+1]] - D[r[j], r[j+1]]
+                if delta < -1e-9:
+                    r[i:j+1] = r[i:j+1][::-1]
+                    improved = True
+    return r
+
 def compute_strategy(
     start: Point,
     artifact_positions: List[Point],
@@ -17,11 +130,14 @@ def compute_strategy(
     Simple greedy strategy:
     - Robot starts at `start`.
     - Visits closest artifact next (nearest neighbor) while time allows.
+    - Optionally (params['use_2opt']) refines the visiting order with 2-opt to cut travel time,
+      keeping the refined order only if it does not lower the score.
     - Travel time = distance / speed.
     - Pickup time = params['pickup_time'] (per artifact).
     - Autonomous window grants autonomous_multiplier on points for items collected during auto_time.
     - Some zones (decode_zone) give extra bonus points per artifact if collected inside.
-    Returns plan with visited order, times, and expected score.
+    Returns plan with visited order, times, and expected score; `visited` is a dict
+    of parallel arrays (pos_x, pos_y, travel_time, ..., gained) in visiting order.
     """
     speed = params.get("robot_speed", 100.0)  # units per second (field units / s)
     pickup_time = params.get("pickup_time", 3.0)  # seconds to pick one artifact
@@ -31,69 +147,92 @@ def compute_strategy(
     decode_zone = params.get("decode_zone", ((450, 100), 80))  # center, radius
     decode_bonus = params.get("decode_bonus", 3)  # extra points if inside zone
     auton_multiplier = params.get("auton_multiplier", 1.5)
+    use_2opt = params.get("use_2opt", False)
 
-    remaining_time = total_time
-    t = 0.0
-    pos = start
-    visited = []
-    score = 0.0
-
-    # copy of artifacts
-    artifacts = artifact_positions.copy()
-    # greedy nearest-first
-    while artifacts:
-        # find nearest artifact
-        dlist = [(euclid(pos, a), a) for a in artifacts]
-        dlist.sort(key=lambda x: x[0])
-        d, target = dlist[0]
-        travel_time = d / speed
-        time_needed = travel_time + pickup_time
+    # artifacts as an (N, 2) array
+    arr = np.asarray(artifact_positions, dtype=np.float64).reshape(-1, 2)
+    # decode zone membership is fixed for the run; compare squared distances once
+    # (squaring would turn a negative radius positive; such a zone matches nothing)
+    (cx, cy), radius = decode_zone
+    in_zone = ((arr[:, 0] - cx) ** 2 + (arr[:, 1] - cy) ** 2 <= radius * radius) & (radius >= 0)
+    # all-pairs distances with the start as row 0, shared by NN and 2-opt;
+    # O((N+1)^2) memory, fine for a field's worth of artifacts
+    pts = np.vstack([np.array(start, dtype=np.float64)[None], arr])
+    D = np.sqrt(((pts[:, None] - pts[None]) ** 2).sum(-1))
 
-        if t + time_needed > total_time:
-            break  # no time to go and pick next artifact
+    def nearest_first(cur, t, alive):
+        # greedy nearest-first from row `cur` of D at clock time `t`
+        if HAVE_NUMBA:
+            order, legs, count = _greedy_nn(
+                D, float(speed), float(pickup_time), float(total_time), cur, float(t), alive
+            )
+            return order[:count].tolist(), legs[:count].tolist()
+        return _greedy_nn_py(pts.tolist(), speed, pickup_time, total_time, cur, t, alive.tolist())
 
-        # move to target
-        t += travel_time
+    alive = np.ones(len(arr), bool)
+    order, legs = nearest_first(0, 0.0, alive)
+    alive[order] = False
+
+    def replay(order, legs):
+        # replay the route: interleave travel and pickup steps so the cumulative sum
+        # reproduces the step-by-step clock (arrival, then pickup) for each artifact
+        count = len(order)
+        travel = np.asarray(legs, dtype=np.float64) / speed
+        steps = np.empty(2 * count)
+        steps[0::2] = travel
+        steps[1::2] = pickup_time
+        clock = np.cumsum(steps)
         # determine if in auton window for pickup
-        in_auton = t <= auton_time
-        # pickup
-        t += pickup_time
+        in_auton = clock[0::2] <= auton_time
+        time_at_pickup = clock[1::2]
 
-        # scoring
-        base = points_per_artifact
-        bonus = 0
-        # decode zone check
-        center, radius = decode_zone
-        if euclid(target, center) <= radius:
-            bonus += decode_bonus
-
-        gained = base + bonus
-        if in_auton:
-            gained *= auton_multiplier
-
-        score += gained
-
-        visited.append({
-            "pos": target,
-            "travel_time": travel_time,
-            "pickup_time": pickup_time,
-            "time_at_pickup": t,
+        # scoring, branchless: decode zone bonus and auton multiplier as per-pickup arrays
+        base = np.full(count, points_per_artifact, float)
+        bonus = in_zone[order] * decode_bonus
+        mult = np.where(in_auton, auton_multiplier, 1.0)
+        gained = (base + bonus) * mult
+        score = float(gained.sum())
+
+        # visited pickups as parallel arrays (one entry per pickup, in visiting order)
+        visited = {
+            "pos_x": arr[order, 0],
+            "pos_y": arr[order, 1],
+            "travel_time": travel,
+            "pickup_time": np.full(count, pickup_time, float),
+            "time_at_pickup": time_at_pickup,
             "in_auton": in_auton,
             "base_points": base,
             "bonus_points": bonus,
             "gained": gained
-        })
+        }
+
+        # final return to start is optional; we compute total used time
+        used_time = float(clock[-1]) if count else 0.0
+        return visited, score, used_time
+
+    visited, score, used_time = replay(order, legs)
 
-        pos = target
-        artifacts.remove(target)
+    # 2-opt never lengthens the route, so every picked artifact stays reachable;
+    # any time it saves goes to more nearest-first pickups from the route's end.
+    # The new order can also move pickups out of the auton window, so keep the
+    # result only if it scores at least as well
+    if use_2opt and len(order) > 2:
+        r = _two_opt(D, [0] + [k + 1 for k in order])
+        r_order = [m - 1 for m in r[1:]]
+        r_legs = [D[a, b] for a, b in zip(r[:-1], r[1:])]
+        extra_order, extra_legs = nearest_first(r[-1], replay(r_order, r_legs)[2], alive)
+        r_order += extra_order
+        r_legs += extra_legs
+        refined = replay(r_order, r_legs)
+        if refined[1] >= score:
+            order = r_order
+            visited, score, used_time = refined
 
-    # final return to start is optional; we compute total used time
-    used_time = t
     return {
         "visited": visited,
         "expected_score": score,
         "used_time": used_time,
-        "remaining_artifacts": len(artifacts),
+        "remaining_artifacts": len(arr) - len(order),
         "params": params
     }
 
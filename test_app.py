@@ -0,0 +1,29 @@
+# test_app.py
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+APP = str(Path(__file__).with_name("app.py"))
+
+
+def _by_label(widgets, label):
+    return next(w for w in widgets if w.label == label)
+
+
+def test_new_run_replaces_result_for_hash_colliding_inputs():
+    # hash(-1) == hash(-2) in CPython; a run with Start X = -2 must not reuse
+    # the stored result for Start X = -1
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    _by_label(at.checkbox, "Use default field layout (recommended)").uncheck().run()
+
+    _by_label(at.number_input, "Start X").set_value(-1).run()
+    at.button[0].click().run()
+    first = at.session_state["last_result"]
+    assert tuple(first["start"]) == (-1, 200)
+
+    _by_label(at.number_input, "Start X").set_value(-2).run()
+    at.button[0].click().run()
+    second = at.session_state["last_result"]
+    assert not at.exception
+    assert tuple(second["start"]) == (-2, 200)
+    assert second["result"]["used_time"] != first["result"]["used_time"]
@@ -0,0 +1,52 @@
+# test_strategy.py
+import random
+
+import numpy as np
+
+import strategy
+from strategy import compute_strategy
+
+
+def _random_layouts(n_layouts, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n_layouts):
+        arts = [(rng.uniform(0, 600), rng.uniform(0, 400)) for _ in range(rng.randint(0, 20))]
+        params = {
+            "robot_speed": rng.uniform(50, 300),
+            "match_time": rng.choice([30, 60, 150]),
+            "auton_time": 30,
+            "decode_zone": ((470, 160), 70),
+        }
+        yield (50, 200), arts, params
+
+
+def test_2opt_never_lowers_score():
+    for start, arts, params in _random_layouts(300):
+        greedy = compute_strategy(start, arts, params)
+        refined = compute_strategy(start, arts, dict(params, use_2opt=True))
+        assert refined["expected_score"] >= greedy["expected_score"]
+
+    # greedy runs out of time with one artifact left; the shorter 2-opt route
+    # leaves enough of the 30 s match to pick it up too
+    arts = [(25, 396), (207, 278), (420, 10), (422, 340), (435, 301), (565, 286), (249, 53)]
+    params = {"robot_speed": 150.0, "match_time": 30, "auton_time": 30, "decode_zone": ((470, 160), 70)}
+    greedy = compute_strategy((50, 200), arts, params)
+    refined = compute_strategy((50, 200), arts, dict(params, use_2opt=True))
+    assert greedy["remaining_artifacts"] == 1
+    assert refined["remaining_artifacts"] < greedy["remaining_artifacts"]
+    assert refined["expected_score"] > greedy["expected_score"]
+
+
+def test_numba_and_python_nn_agree(monkeypatch):
+    # without numba installed this still compares _greedy_nn (run as plain Python)
+    # against _greedy_nn_py
+    for start, arts, params in _random_layouts(300, seed=1):
+        monkeypatch.setattr(strategy, "HAVE_NUMBA", True)
+        compiled = compute_strategy(start, arts, params)
+        monkeypatch.setattr(strategy, "HAVE_NUMBA", False)
+        plain = compute_strategy(start, arts, params)
+        assert compiled["remaining_artifacts"] == plain["remaining_artifacts"]
+        for key, values in compiled["visited"].items():
+            np.testing.assert_allclose(values, plain["visited"][key], rtol=0, atol=1e-9)
+        assert np.isclose(compiled["expected_score"], plain["expected_score"])
+        assert np.isclose(compiled["used_time"], plain["used_time"])